@@ -0,0 +1,73 @@
+"""Compare cold and warm yt-dlp extraction latency.
+
+Importing main sets up its logging pipeline, so results go to the console
+and are appended as JSON lines to LOG_FILE (app.log by default).
+"""
+import logging
+import statistics
+import tempfile
+import time
+import yt_dlp
+from main import YTDLP_OPTIONS, YtDlpPool
+
+logger = logging.getLogger(__name__)
+
+TEST_URLS = [
+    "https://www.youtube.com/watch?v=jNQXAC9IVRw",  # "Me at the zoo"
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+]
+ROUNDS = 3
+
+def extract(ydl, url):
+    """Time a metadata-only extraction"""
+    start = time.perf_counter()
+    info = ydl.extract_info(url, download=False)
+    if not info:
+        raise Exception(f"Failed to extract video info: {url}")
+    return time.perf_counter() - start
+
+def bench_cold():
+    """New YoutubeDL and empty cache directory for every extraction"""
+    timings = []
+    for _ in range(ROUNDS):
+        for url in TEST_URLS:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                with yt_dlp.YoutubeDL({**YTDLP_OPTIONS, 'cachedir': cache_dir}) as ydl:
+                    timings.append(extract(ydl, url))
+    return timings
+
+def bench_warm():
+    """Pooled YoutubeDL instance with a persistent cache directory"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        pool = YtDlpPool({**YTDLP_OPTIONS, 'cachedir': cache_dir}, size=1)
+        # Warm-up extraction, not timed
+        with pool.instance() as ydl:
+            extract(ydl, TEST_URLS[0])
+        timings = []
+        for _ in range(ROUNDS):
+            for url in TEST_URLS:
+                with pool.instance() as ydl:
+                    timings.append(extract(ydl, url))
+        pool.close()
+    return timings
+
+def report(name, timings):
+    logger.info(
+        f"{name}: n={len(timings)} "
+        f"mean={statistics.mean(timings):.2f}s "
+        f"median={statistics.median(timings):.2f}s "
+        f"min={min(timings):.2f}s max={max(timings):.2f}s"
+    )
+
+def main():
+    logger.info("Benchmarking yt-dlp extraction latency (cold vs warm)...")
+    cold = bench_cold()
+    warm = bench_warm()
+    
+    logger.info("\nResults:")
+    report("Cold", cold)
+    report("Warm", warm)
+    logger.info(f"Speedup (median): {statistics.median(cold) / statistics.median(warm):.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -5,32 +5,141 @@ import google.generativeai as genai
 from pytube import YouTube
 from pytube.exceptions import VideoUnavailable, RegexMatchError, PytubeError
 import yt_dlp
-from fastapi import FastAPI, HTTPException
+from yt_dlp.postprocessor.ffmpeg import FFmpegPostProcessor
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
 from dotenv import load_dotenv
 import logging
+import logging.handlers
+import queue
+import atexit
+import copy
+import threading
+from contextlib import contextmanager
 from fastapi.responses import JSONResponse
 from fastapi.encoders import jsonable_encoder
-import traceback
 import shutil
+import re
+import math
+import subprocess
+from urllib.parse import urlparse, parse_qs, urlencode
+import json
+import gzip
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Union
 import imageio_ffmpeg as ffmpeg
 import assemblyai as aai
 
-# Enhanced logging setup
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('app.log')
-    ]
-)
-logger = logging.getLogger(__name__)
+# Brotli is optional; responses fall back to gzip when it is not installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
-# Load API keys from .env file
+# Load API keys and logging settings from .env file
 load_dotenv()
 
+# Logging configuration
+LOG_FILE = os.getenv("LOG_FILE", "app.log")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024))  # 10 MB
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", 5))
+# Per-logger overrides, e.g. "yt_dlp=DEBUG,assemblyai=WARNING"
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# Only every Nth yt-dlp debug line is logged; warnings and errors always are
+YTDLP_LOG_SAMPLE_EVERY = max(1, int(os.getenv("YTDLP_LOG_SAMPLE_EVERY", 20)))
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as one JSON object per line"""
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the traceback apart from the message.
+
+    The stock prepare() merges the traceback into the message text, which
+    leaves JsonFormatter nothing to put in its exc_info field.
+    """
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            # Traceback objects should not cross threads; send the formatted text
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def setup_logging():
+    """Route all records through a queue so disk I/O happens on a background thread"""
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    )
+    file_handler = logging.handlers.RotatingFileHandler(
+        LOG_FILE,
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding='utf-8'
+    )
+    file_handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    root_logger = logging.getLogger()
+    root_logger.handlers[:] = [StructuredQueueHandler(log_queue)]
+    root_logger.setLevel(LOG_LEVEL)
+
+    for override in LOG_LEVELS.split(','):
+        name, _, level = override.partition('=')
+        if name.strip() and level.strip():
+            logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+    listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+log_listener = setup_logging()
+logger = logging.getLogger(__name__)
+
+class YtDlpLogger:
+    """Capture yt-dlp output at debug level, sampling its chatty progress lines"""
+    def __init__(self, sample_every=YTDLP_LOG_SAMPLE_EVERY):
+        self.logger = logging.getLogger("yt_dlp")
+        self.sample_every = sample_every
+        self.count = 0
+
+    def debug(self, msg):
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        self.count += 1
+        if (self.count - 1) % self.sample_every == 0:
+            self.logger.debug(msg)
+
+    def info(self, msg):
+        self.debug(msg)
+
+    def warning(self, msg):
+        self.logger.warning(msg)
+
+    def error(self, msg):
+        self.logger.error(msg)
+
 ASSEMBLYAI_API_KEY = os.getenv("ASSEMBLYAI_API_KEY")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
@@ -49,11 +158,72 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Matches YouTube-style offsets such as "90", "90s", "2m", "1h2m3s"
+TIMESTAMP_PART_RE = re.compile(r'^\d+(?:\.\d+)?$')
+TIMESTAMP_UNITS_RE = re.compile(r'^(?:(\d+)h)?(?:(\d+)m)?(?:(\d+(?:\.\d+)?)s?)?$')
+
+def parse_timestamp(value):
+    """Convert seconds, "hh:mm:ss"/"mm:ss" or "1h2m3s" into seconds (float)"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        if not math.isfinite(value):
+            raise ValueError(f"Invalid timestamp: {value}")
+        return value
+    value = str(value).strip().lower()
+    if not value:
+        return None
+    if ':' in value:
+        parts = value.split(':')
+        if len(parts) > 3:
+            raise ValueError(f"Invalid timestamp: {value}")
+        seconds = 0.0
+        for part in parts:
+            if not TIMESTAMP_PART_RE.match(part):
+                raise ValueError(f"Invalid timestamp: {value}")
+            seconds = seconds * 60 + float(part)
+        return seconds
+    match = TIMESTAMP_UNITS_RE.match(value)
+    if not match:
+        raise ValueError(f"Invalid timestamp: {value}")
+    hours, minutes, seconds = match.groups()
+    return int(hours or 0) * 3600 + int(minutes or 0) * 60 + float(seconds or 0)
+
+def resolve_time_range(video_url, start_time=None, end_time=None):
+    """Return the (start, end) section to process, falling back to `t=` in the URL"""
+    if start_time is None:
+        query = parse_qs(urlparse(video_url).query)
+        if 't' in query:
+            try:
+                start_time = parse_timestamp(query['t'][0])
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid t= parameter: {query['t'][0]}")
+    if start_time is not None and start_time < 0:
+        raise HTTPException(status_code=400, detail="start_time must not be negative")
+    if end_time is not None and end_time <= (start_time or 0):
+        raise HTTPException(status_code=400, detail="end_time must be after start_time")
+    if not start_time:
+        start_time = None
+    return start_time, end_time
+
+def section_cache_key(video_url, start_time, end_time):
+    """Cache key for a video section; `t=` is dropped since it is folded into start_time"""
+    parsed = urlparse(video_url)
+    query = [(k, v) for k, v in parse_qs(parsed.query).items() if k != 't']
+    return (parsed._replace(query=urlencode(query, doseq=True)).geturl(), start_time, end_time)
+
 class VideoRequest(BaseModel):
     video_url: str
+    # Optional section to quiz on, in seconds or "hh:mm:ss"; defaults to the whole video
+    start_time: Optional[Union[float, str]] = None
+    end_time: Optional[Union[float, str]] = None
 
-def download_audio_pytube(youtube_url):
-    """Attempt to download audio using PyTube"""
+    @validator('start_time', 'end_time')
+    def parse_time(cls, value):
+        return parse_timestamp(value)
+
+def download_audio_pytube(youtube_url, start_time=None, end_time=None):
+    """Attempt to download audio using PyTube, trimmed to the requested section"""
     try:
         logger.info(f"Starting PyTube download from: {youtube_url}")
         timestamp = int(time.time())
@@ -69,7 +239,12 @@ def download_audio_pytube(youtube_url):
         
         audio_stream = streams[0]
         logger.info(f"Selected audio stream: {audio_stream.abr}kbps")
-        audio_stream.download(filename=output_path)
+        if start_time is not None or end_time is not None:
+            # Let FFmpeg seek into the stream URL so only the section is fetched
+            output_path = f"audio_{timestamp}.{audio_stream.subtype}"
+            download_audio_section(audio_stream.url, output_path, start_time, end_time)
+        else:
+            audio_stream.download(filename=output_path)
         
         if not os.path.exists(output_path):
             raise Exception("Failed to create audio file")
@@ -97,6 +272,32 @@ def get_ffmpeg_path():
 # Update FFmpeg path using imageio_ffmpeg
 FFMPEG_PATH = get_ffmpeg_path()
 
+def download_audio_section(source, output_path, start_time=None, end_time=None):
+    """Copy a section of an audio file or stream URL using FFmpeg input seeking"""
+    if not FFMPEG_PATH:
+        raise Exception("FFmpeg is required to download a section")
+    
+    cmd = [FFMPEG_PATH, '-y']
+    if source.startswith(('http://', 'https://')):
+        cmd += ['-user_agent', USER_AGENT]
+    cmd += ['-ss', str(start_time or 0), '-i', source]
+    if end_time is not None:
+        cmd += ['-t', str(end_time - (start_time or 0))]
+    cmd += ['-vn', '-c:a', 'copy', output_path]
+    
+    logger.info(f"Fetching audio section {start_time or 0}s-{end_time if end_time is not None else 'end'}")
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=DOWNLOAD_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise Exception(f"FFmpeg section download timed out after {DOWNLOAD_TIMEOUT} seconds")
+    if result.returncode != 0 or not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise Exception(f"FFmpeg section download failed: {result.stderr.strip()[-500:]}")
+    return output_path
+
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 CHROME_VERSION = '120.0.0.0'
 
@@ -105,39 +306,155 @@ MAX_RETRIES = 3
 RETRY_DELAY = 5
 DOWNLOAD_TIMEOUT = 300  # 5 minutes
 
-def download_audio_ytdlp(youtube_url):
-    """Attempt to download audio using yt-dlp with retries"""
+# yt-dlp instance pool configuration
+YTDLP_POOL_SIZE = int(os.getenv("YTDLP_POOL_SIZE", 2))
+# Persistent cache for YouTube player JS and signature functions, shared by all instances
+YTDLP_CACHE_DIR = os.getenv(
+    "YTDLP_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".ytdlp_cache")
+)
+
+YTDLP_OPTIONS = {
+    'format': 'bestaudio/best',
+    'postprocessors': [{
+        'key': 'FFmpegExtractAudio',
+        'preferredcodec': 'mp3',
+        'preferredquality': '192',
+    }],
+    'quiet': True,
+    'http_headers': {
+        'User-Agent': USER_AGENT,
+        'Referer': 'https://www.youtube.com/',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-us,en;q=0.5',
+        'Sec-Fetch-Mode': 'navigate',
+    },
+    'socket_timeout': DOWNLOAD_TIMEOUT,
+    'retries': 10,  # Internal yt-dlp retries
+    'nocheckcertificate': True,
+    'cachedir': YTDLP_CACHE_DIR,
+}
+
+if FFMPEG_PATH:
+    YTDLP_OPTIONS['ffmpeg_location'] = FFMPEG_PATH
+    # Section downloads check for FFmpeg without a YoutubeDL instance, so they
+    # only see the class-level location (this is what the yt-dlp CLI sets too)
+    FFmpegPostProcessor._ffmpeg_location.set(FFMPEG_PATH)
+
+class YtDlpPool:
+    """Pool of long-lived YoutubeDL instances.
+
+    Each instance keeps its extractors (with their in-memory player and
+    signature caches) and its HTTP connections between requests. An instance
+    is used by one request at a time; per-request options are applied on
+    checkout and restored on return. An instance whose use raised is closed
+    rather than returned, so a retry starts from a fresh one.
+
+    Only options in OVERRIDABLE_OPTIONS may be overridden: yt-dlp reads them
+    on every download. Options consumed in YoutubeDL.__init__ (postprocessors,
+    ffmpeg_location, logger, cookiefile, ...) must be set in the pool options.
+    """
+    OVERRIDABLE_OPTIONS = frozenset({'outtmpl', 'format', 'download_ranges'})
+
+    def __init__(self, options, size=YTDLP_POOL_SIZE):
+        self.options = options
+        self.size = size
+        self._idle = queue.LifoQueue()  # most recently used (warmest) first
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _new_instance(self):
+        return yt_dlp.YoutubeDL({**self.options, 'logger': YtDlpLogger()})
+
+    def _checkout(self, timeout):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                logger.info(f"Creating yt-dlp instance {self._created}/{self.size}")
+                try:
+                    return self._new_instance()
+                except Exception:
+                    self._created -= 1
+                    raise
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise Exception(f"No yt-dlp instance available after {timeout} seconds")
+
+    @contextmanager
+    def instance(self, overrides=None, timeout=DOWNLOAD_TIMEOUT):
+        """Check out an instance with `overrides` applied to its options"""
+        overrides = overrides or {}
+        unsupported = set(overrides) - self.OVERRIDABLE_OPTIONS
+        if unsupported:
+            raise ValueError(
+                f"yt-dlp option(s) cannot be overridden per request: {', '.join(sorted(unsupported))}"
+            )
+
+        ydl = self._checkout(timeout)
+        saved = {}
+        missing = object()
+        try:
+            for key, value in overrides.items():
+                saved[key] = ydl.params.get(key, missing)
+                if key == 'outtmpl' and isinstance(value, str):
+                    # YoutubeDL stores output templates keyed by type
+                    value = {**ydl.params.get('outtmpl', {}), 'default': value}
+                ydl.params[key] = value
+            yield ydl
+        except BaseException:
+            # Don't hand possibly broken extractor or connection state to the next caller
+            self._discard(ydl)
+            raise
+        for key, value in saved.items():
+            if value is missing:
+                ydl.params.pop(key, None)
+            else:
+                ydl.params[key] = value
+        self._idle.put(ydl)
+
+    def _discard(self, ydl):
+        try:
+            ydl.close()
+        except Exception as e:
+            logger.warning(f"Failed to close yt-dlp instance: {e}")
+        with self._lock:
+            self._created -= 1
+
+    def close(self):
+        """Close idle instances, saving cookies and releasing connections"""
+        while True:
+            try:
+                ydl = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(ydl)
+
+ytdlp_pool = YtDlpPool(YTDLP_OPTIONS)
+
+def download_audio_ytdlp(youtube_url, start_time=None, end_time=None):
+    """Attempt to download audio using pooled yt-dlp instances with retries"""
     timestamp = int(time.time())
     output_path = f"audio_{timestamp}.mp3"
     last_exception = None
     
-    ydl_opts = {
-        'format': 'bestaudio/best',
-        'postprocessors': [{
-            'key': 'FFmpegExtractAudio',
-            'preferredcodec': 'mp3',
-            'preferredquality': '192',
-        }],
-        'outtmpl': output_path,
-        'quiet': False,
-        'verbose': True,
-        'http_headers': {
-            'User-Agent': USER_AGENT,
-            'Referer': 'https://www.youtube.com/',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-us,en;q=0.5',
-            'Sec-Fetch-Mode': 'navigate',
-        },
-        'socket_timeout': DOWNLOAD_TIMEOUT,
-        'retries': 10,  # Internal yt-dlp retries
-        'nocheckcertificate': True,
-    }
+    overrides = {'outtmpl': output_path}
+    if start_time is not None or end_time is not None:
+        # Only fetch the requested section (downloaded through FFmpeg)
+        section_end = end_time if end_time is not None else float('inf')
+        overrides['download_ranges'] = yt_dlp.utils.download_range_func(
+            None, [(start_time or 0, section_end)]
+        )
     
     for attempt in range(MAX_RETRIES):
         try:
             logger.info(f"Download attempt {attempt + 1}/{MAX_RETRIES} for: {youtube_url}")
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with ytdlp_pool.instance(overrides) as ydl:
                 info = ydl.extract_info(youtube_url, download=True)
                 
                 if not info:
@@ -175,20 +492,20 @@ def download_audio_ytdlp(youtube_url):
     logger.error(error_msg)
     raise Exception(error_msg)
 
-def download_audio(youtube_url):
+def download_audio(youtube_url, start_time=None, end_time=None):
     """Main download function with fallback strategy"""
     errors = []
     
     # Try yt-dlp with retries first
     try:
-        return download_audio_ytdlp(youtube_url)
+        return download_audio_ytdlp(youtube_url, start_time, end_time)
     except Exception as e:
         errors.append(f"yt-dlp error: {str(e)}")
         logger.warning("yt-dlp failed, trying PyTube...")
         
         # Try PyTube as fallback
         try:
-            return download_audio_pytube(youtube_url)
+            return download_audio_pytube(youtube_url, start_time, end_time)
         except Exception as e:
             errors.append(f"PyTube error: {str(e)}")
             error_msg = "All download methods failed:\n" + "\n".join(errors)
@@ -271,6 +588,146 @@ def parse_quiz_questions(quiz_text):
     
     return questions
 
+# Response shaping, compression and result caching
+RESULT_CACHE_SIZE = 64
+RESULT_CACHE_TTL = 3600  # 1 hour
+MIN_COMPRESS_SIZE = 1024  # bytes; smaller bodies are sent as-is
+# Moderate levels: compression runs inside the async handler, so keep it cheap
+BROTLI_QUALITY = 4
+GZIP_LEVEL = 6
+RESPONSE_FIELDS = ("quiz", "transcript")
+
+# (video_url, start_time, end_time) -> (stored_at, {"transcript": ..., "quiz": ...}), oldest first
+_result_cache = OrderedDict()
+
+def get_cached_result(key):
+    """Return the cached transcript/quiz for a video section, or None if missing or expired"""
+    entry = _result_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, result = entry
+    if time.time() - stored_at > RESULT_CACHE_TTL:
+        del _result_cache[key]
+        return None
+    _result_cache.move_to_end(key)
+    return result
+
+def cache_result(key, result):
+    """Store a result, evicting the least recently used entries past the size limit"""
+    _result_cache[key] = (time.time(), result)
+    _result_cache.move_to_end(key)
+    while len(_result_cache) > RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+
+def parse_include(include):
+    """Parse the comma-separated `include` parameter into a set of response fields"""
+    fields = {field.strip() for field in include.split(',') if field.strip()}
+    unknown = fields - set(RESPONSE_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include field(s): {', '.join(sorted(unknown))}. "
+                   f"Allowed: {', '.join(RESPONSE_FIELDS)}"
+        )
+    return fields
+
+def shape_result(result, fields, transcript_offset=0, transcript_limit=None):
+    """Build the response payload with only the requested fields"""
+    payload = {"status": "success"}
+    if "quiz" in fields:
+        payload["quiz"] = result["quiz"]
+    if "transcript" in fields:
+        transcript = result["transcript"]
+        if transcript_offset or transcript_limit is not None:
+            total = len(transcript)
+            end = total if transcript_limit is None else min(total, transcript_offset + transcript_limit)
+            payload["transcript"] = transcript[transcript_offset:end]
+            payload["transcript_page"] = {
+                "offset": transcript_offset,
+                "limit": transcript_limit,
+                "total": total,
+                "next_offset": end if end < total else None
+            }
+        else:
+            payload["transcript"] = transcript
+    return payload
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+def accepted_encodings(accept_encoding):
+    """Map each content coding named in Accept-Encoding to its q-value"""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        coding, *params = part.split(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value.strip())
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+def encoding_allowed(accepted, coding):
+    """Whether a coding is acceptable; `*` only covers codings not named explicitly"""
+    if coding in accepted:
+        return accepted[coding] > 0
+    return accepted.get('*', 0) > 0
+
+def compress_body(body, accept_encoding):
+    """Compress a response body with brotli or gzip, whichever the client supports"""
+    if len(body) < MIN_COMPRESS_SIZE:
+        return body, None
+    accepted = accepted_encodings(accept_encoding)
+    if brotli is not None and encoding_allowed(accepted, 'br'):
+        return brotli.compress(body, quality=BROTLI_QUALITY), 'br'
+    if encoding_allowed(accepted, 'gzip'):
+        return gzip.compress(body, compresslevel=GZIP_LEVEL), 'gzip'
+    return body, None
+
+def build_response(request, payload):
+    """Serialize a payload with an ETag, honouring If-None-Match and Accept-Encoding.
+
+    If-None-Match is only evaluated for GET/HEAD; other methods ignore it.
+    """
+    body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    # Weak ETag: the same payload is equivalent whatever content coding is used
+    etag = f'W/"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {
+        "ETag": etag,
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "no-cache"
+    }
+    if request.method in ('GET', 'HEAD') and etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+
+    body, encoding = compress_body(body, request.headers.get('accept-encoding'))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@app.on_event("shutdown")
+async def shutdown():
+    ytdlp_pool.close()
+
 @app.get("/")
 async def root():
     return {"message": "API is working!"}
@@ -287,9 +744,41 @@ async def http_exception_handler(request, exc):
         })
     )
 
+# Serve a previously generated quiz; supports conditional GETs for polling clients
+@app.api_route("/transcribe", methods=["GET", "HEAD"])
+async def get_transcription(
+    http_request: Request,
+    video_url: str,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    include: str = Query(",".join(RESPONSE_FIELDS)),
+    transcript_offset: int = Query(0, ge=0),
+    transcript_limit: Optional[int] = Query(None, ge=1)
+):
+    fields = parse_include(include)
+    try:
+        start_time, end_time = parse_timestamp(start_time), parse_timestamp(end_time)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    start_time, end_time = resolve_time_range(video_url, start_time, end_time)
+    result = get_cached_result(section_cache_key(video_url, start_time, end_time))
+    if result is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No cached result for this video. POST /transcribe to generate one."
+        )
+    payload = shape_result(result, fields, transcript_offset, transcript_limit)
+    return build_response(http_request, payload)
+
 # FastAPI endpoint to generate a quiz from a YouTube video
 @app.post("/transcribe")
-async def transcribe_video(request: VideoRequest):
+async def transcribe_video(
+    request: VideoRequest,
+    http_request: Request,
+    include: str = Query(",".join(RESPONSE_FIELDS)),
+    transcript_offset: int = Query(0, ge=0),
+    transcript_limit: Optional[int] = Query(None, ge=1)
+):
     if not FFMPEG_PATH:
         raise HTTPException(
             status_code=500,
@@ -310,9 +799,24 @@ async def transcribe_video(request: VideoRequest):
                 detail="Invalid YouTube URL format"
             )
         
+        fields = parse_include(include)
+        start_time, end_time = resolve_time_range(
+            request.video_url, request.start_time, request.end_time
+        )
+        if start_time is not None or end_time is not None:
+            logger.info(f"Requested section: {start_time or 0}s-{end_time if end_time is not None else 'end'}")
+        cache_key = section_cache_key(request.video_url, start_time, end_time)
+        
+        # Serve repeated requests from the result cache
+        result = get_cached_result(cache_key)
+        if result is not None:
+            logger.info("Serving cached result")
+            payload = shape_result(result, fields, transcript_offset, transcript_limit)
+            return build_response(http_request, payload)
+        
         # Download audio with detailed error tracking
         try:
-            audio_path = download_audio(request.video_url)
+            audio_path = download_audio(request.video_url, start_time, end_time)
             logger.info(f"Audio downloaded successfully to: {audio_path}")
         except Exception as e:
             logger.error(f"Audio download failed: {str(e)}")
@@ -344,17 +848,19 @@ async def transcribe_video(request: VideoRequest):
                 detail=f"Quiz generation failed: {str(e)}"
             )
         
-        return {
-            "status": "success",
+        result = {
             "transcript": transcript,
             "quiz": quiz_questions
         }
+        cache_result(cache_key, result)
+        
+        payload = shape_result(result, fields, transcript_offset, transcript_limit)
+        return build_response(http_request, payload)
             
     except HTTPException as he:
         raise he
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Unexpected error: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"Server error: {str(e)}"
@@ -111,6 +111,107 @@ def test_video_download(video_url):
         logger.error(f"Test failed with error: {str(e)}")
         return False
 
+def test_response_shaping(video_url):
+    """Test field selection, compression and conditional GETs on a cached result"""
+    logger.info(f"\nTesting response shaping: {video_url}")
+    
+    try:
+        # Quiz only, no transcript (result is cached by test_video_download)
+        response = requests.post(
+            f"{BASE_URL}/transcribe",
+            params={"include": "quiz"},
+            json={"video_url": video_url},
+            headers={"Accept-Encoding": "gzip"},
+            timeout=300
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert "quiz" in data
+        assert "transcript" not in data
+        etag = response.headers.get("ETag")
+        assert etag
+        logger.info(f"Quiz-only response: {len(response.content)} bytes, ETag {etag}")
+        
+        # Paginated transcript
+        response = requests.get(
+            f"{BASE_URL}/transcribe",
+            params={"video_url": video_url, "include": "transcript", "transcript_limit": 100}
+        )
+        assert response.status_code == 200
+        page = response.json()["transcript_page"]
+        assert page["offset"] == 0 and page["limit"] == 100
+        
+        # Polling with the same ETag should not re-download the payload
+        response = requests.get(
+            f"{BASE_URL}/transcribe",
+            params={"video_url": video_url, "include": "quiz"},
+            headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert not response.content
+        
+        # HEAD honours the ETag too
+        response = requests.head(
+            f"{BASE_URL}/transcribe",
+            params={"video_url": video_url, "include": "quiz"},
+            headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        
+        # A coding refused with q=0 is never used, even when * is accepted
+        for refused in ("br", "gzip"):
+            response = requests.get(
+                f"{BASE_URL}/transcribe",
+                params={"video_url": video_url},
+                headers={"Accept-Encoding": f"{refused};q=0, *"}
+            )
+            assert response.status_code == 200
+            assert response.headers.get("Content-Encoding") != refused
+        
+        # Unknown fields are rejected
+        response = requests.get(
+            f"{BASE_URL}/transcribe",
+            params={"video_url": video_url, "include": "subtitles"}
+        )
+        assert response.status_code == 400
+        
+        logger.info("Response shaping test passed!")
+        return True
+    except Exception as e:
+        logger.error(f"Response shaping test failed: {str(e)}")
+        return False
+
+def test_video_section(video_url):
+    """Test quiz generation on a time range, given explicitly and via t= in the URL"""
+    logger.info(f"\nTesting video section: {video_url}")
+    
+    try:
+        response = requests.post(
+            f"{BASE_URL}/transcribe",
+            json={"video_url": video_url, "start_time": 5, "end_time": 10},
+            timeout=300
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "success"
+        assert len(data["quiz"]) > 0
+        etag = response.headers.get("ETag")
+        
+        # t=5 in the URL selects the same section, so it is served from the cache
+        response = requests.post(
+            f"{BASE_URL}/transcribe",
+            json={"video_url": f"{video_url}&t=5", "end_time": 10},
+            timeout=300
+        )
+        assert response.status_code == 200
+        assert response.headers.get("ETag") == etag
+        
+        logger.info("Video section test passed!")
+        return True
+    except Exception as e:
+        logger.error(f"Video section test failed: {str(e)}")
+        return False
+
 def test_error_handling():
     """Test various error scenarios"""
     test_cases = [
@@ -128,6 +229,21 @@ def test_error_handling():
             "name": "Non-YouTube URL",
             "data": {"video_url": "https://example.com"},
             "expected_status": 400
+        },
+        {
+            "name": "Section ends before it starts",
+            "data": {"video_url": TEST_VIDEOS[0]["url"], "start_time": "0:10", "end_time": 5},
+            "expected_status": 400
+        },
+        {
+            "name": "Invalid t= parameter",
+            "data": {"video_url": TEST_VIDEOS[0]["url"] + "&t=abc"},
+            "expected_status": 400
+        },
+        {
+            "name": "Invalid timestamp",
+            "data": {"video_url": TEST_VIDEOS[0]["url"], "start_time": "ten minutes"},
+            "expected_status": 422
         }
     ]
     
@@ -166,7 +282,9 @@ def run_all_tests():
     # Test 3: Video Processing
     success_count = 0
     for video in TEST_VIDEOS:
-        if test_video_download(video["url"]):
+        if (test_video_download(video["url"])
+                and test_response_shaping(video["url"])
+                and test_video_section(video["url"])):
             success_count += 1
         time.sleep(2)  # Add delay between tests
     